@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from .auth import router as auth_router
 from .users import router as users_router
+from .stats import router as stats_router
 
 api_router = APIRouter()
 
@@ -9,4 +10,7 @@ api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 
 # Include user routes  
-api_router.include_router(users_router, prefix="/users", tags=["Users"])
\ No newline at end of file
+api_router.include_router(users_router, prefix="/users", tags=["Users"])
+
+# Include stats routes
+api_router.include_router(stats_router, prefix="/stats", tags=["Stats"])
\ No newline at end of file
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from typing import Optional
 
 from app.data.db import get_db
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
+from app.services.audit_service import AuditService, client_ip
+from app.services.idempotency_service import IdempotencyService
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.deps import get_optional_token_data, get_job_queue
+from app.jobs.queue import JobQueue
+from app.data.models import AuditAction
 from app.data.schema import (
     UserRegisterRequest,
     UserLoginRequest,
@@ -13,7 +19,8 @@ from app.data.schema import (
     LoginResponse,
     LogoutResponse,
     UserResponse,
-    TokenResponse
+    TokenResponse,
+    TokenData
 )
 
 router = APIRouter()
@@ -22,7 +29,10 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserRegisterRequest,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_db),
+    job_queue: JobQueue = Depends(get_job_queue),
+    idempotency_key: Optional[str] = Header(None)
 ):
     """
     Register a new user
@@ -31,17 +41,35 @@ async def register_user(
     - **email**: User's email address (must be unique)
     - **password**: User's password (minimum 8 characters)
     - **role**: User's role (student, donor, or mentor)
+    
+    Send an **Idempotency-Key** header to make retries safe: repeating the
+    request with the same key and body returns the original response.
     """
+    idempotency_scope = "auth.register"
+    if idempotency_key:
+        request_hash = IdempotencyService.request_hash(user_data.model_dump(mode="json"))
+        stored = IdempotencyService.begin(db, idempotency_key, idempotency_scope, request_hash)
+        if stored is not None:
+            return IdempotencyService.replay(stored, request_hash)
+    
     try:
         user = UserService.create_user(
             db=db,
             name=user_data.name,
             email=user_data.email,
             password=user_data.password,
-            role=user_data.role.value
+            role=user_data.role.value,
+            job_queue=job_queue
+        )
+        
+        AuditService.log_event(
+            AuditAction.REGISTER,
+            actor_id=user.id,
+            subject_id=user.id,
+            ip_address=client_ip(request)
         )
         
-        return UserResponse(
+        user_response = UserResponse(
             id=str(user.id),
             name=user.name,
             email=user.email,
@@ -50,18 +78,39 @@ async def register_user(
             created_at=user.created_at.isoformat()
         )
     
-    except HTTPException:
+    except HTTPException as e:
+        if idempotency_key:
+            # Client errors are final for this request body, server errors can be retried
+            if e.status_code < 500:
+                IdempotencyService.complete(db, idempotency_key, idempotency_scope, e.status_code, {"detail": e.detail})
+            else:
+                IdempotencyService.release(db, idempotency_key, idempotency_scope)
         raise
     except Exception as e:
+        if idempotency_key:
+            IdempotencyService.release(db, idempotency_key, idempotency_scope)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred during registration"
         )
+    
+    if idempotency_key:
+        IdempotencyService.complete(
+            db,
+            idempotency_key,
+            idempotency_scope,
+            status.HTTP_201_CREATED,
+            user_response.model_dump(mode="json")
+        )
+    
+    return user_response
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login_user(
     login_data: UserLoginRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -75,6 +124,11 @@ async def login_user(
     
     # Check if user exists and password is correct
     if not user:
+        AuditService.log_event(
+            AuditAction.LOGIN_FAILED,
+            ip_address=client_ip(request),
+            details={"email": login_data.email}
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -82,12 +136,27 @@ async def login_user(
         )
     
     if not AuthService.verify_password(login_data.password, user.password_hash):
+        AuditService.log_event(
+            AuditAction.LOGIN_FAILED,
+            subject_id=user.id,
+            ip_address=client_ip(request),
+            details={"email": login_data.email}
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Rehash outdated hashes after the response is sent
+    if AuthService.password_needs_update(user.password_hash):
+        background_tasks.add_task(
+            UserService.upgrade_password_hash,
+            str(user.id),
+            user.password_hash,
+            login_data.password
+        )
+    
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = AuthService.create_access_token(
         data={
@@ -98,15 +167,30 @@ async def login_user(
         expires_delta=access_token_expires
     )
     
+    AuditService.log_event(
+        AuditAction.LOGIN,
+        actor_id=user.id,
+        subject_id=user.id,
+        ip_address=client_ip(request)
+    )
+    
     return TokenResponse(access_token=access_token, token_type="bearer", expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 
 @router.post("/logout")
-async def logout_user():
+async def logout_user(
+    request: Request,
+    current_user: Optional[TokenData] = Depends(get_optional_token_data)
+):
     """
     Logout user (invalidate session)
     
     Note: With JWT tokens, logout is typically handled client-side by removing the token.
     For server-side invalidation, you would need to implement a token blacklist.
     """
+    AuditService.log_event(
+        AuditAction.LOGOUT,
+        actor_id=current_user.user_id if current_user else None,
+        ip_address=client_ip(request)
+    )
     return LogoutResponse()
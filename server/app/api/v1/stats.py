@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from app.data.db import get_db
+from app.data.models import UserRole
+from app.data.schema import StatsResponse, TokenData
+from app.services.stats_service import StatsService
+from app.core.deps import require_role
+
+router = APIRouter()
+
+
+@router.get("", response_model=StatsResponse)
+async def get_stats(
+    response: Response,
+    days: int = Query(30, ge=1, le=366, description="Number of days of registrations to return"),
+    current_user: TokenData = Depends(require_role(UserRole.DONOR.value)),
+    db: Session = Depends(get_db)
+):
+    """
+    Get dashboard aggregates
+    
+    - **days**: Number of days of registrations to return (default 30)
+    
+    Served from precomputed counters, so the cost does not grow with the
+    number of users. Only available to donors.
+    """
+    response.headers["Cache-Control"] = "private, max-age=60"
+    return StatsService.get_summary(db, days)
@@ -1,26 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import Union
+from typing import Optional, Set, Union
 
 from app.data.db import get_db
 from app.data.schema import UserDetailResponse, TokenData
 from app.services.user_service import UserService
-from app.core.deps import get_current_active_user
+from app.services.audit_service import AuditService, client_ip
+from app.data.models import AuditAction
+from app.core.deps import get_current_active_user, sparse_fieldset
+from app.core.http_cache import user_etag, etag_matches, cache_headers, not_modified_response
 
 router = APIRouter()
 
 
-@router.get("/me", response_model=UserDetailResponse)
-async def get_current_user_details(
-    current_user: TokenData = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get current authenticated user's details
+def _user_detail_response(
+    user_id: str,
+    request: Request,
+    response: Response,
+    current_user: TokenData,
+    db: Session,
+    if_none_match: Optional[str],
+    fields: Optional[Set[str]]
+) -> Union[UserDetailResponse, Response]:
+    """Build a user details response, answering conditional requests with 304"""
+    # Each fieldset is a different representation and needs its own ETag
+    variant = ",".join(sorted(fields)) if fields else ""
     
-    Convenience endpoint to get the current user's own details
-    """
-    user = UserService.get_user_by_id(db, current_user.user_id)
+    # A cached row version lets unchanged resources skip the database entirely
+    cached_version = UserService.get_cached_version(user_id)
+    if cached_version is not None:
+        etag = user_etag(user_id, cached_version, variant)
+        if etag_matches(if_none_match, etag):
+            AuditService.log_event(
+                AuditAction.USER_VIEWED,
+                actor_id=current_user.user_id,
+                subject_id=user_id,
+                ip_address=client_ip(request)
+            )
+            return not_modified_response(etag)
+    
+    user = UserService.get_user_by_id(db, user_id)
     
     if not user:
         raise HTTPException(
@@ -28,7 +48,20 @@ async def get_current_user_details(
             detail="User not found"
         )
     
-    return UserDetailResponse(
+    UserService.remember_user(user)
+    
+    AuditService.log_event(
+        AuditAction.USER_VIEWED,
+        actor_id=current_user.user_id,
+        subject_id=user.id,
+        ip_address=client_ip(request)
+    )
+    
+    etag = user_etag(user.id, user.version, variant)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+    
+    user_details = UserDetailResponse(
         id=str(user.id),
         name=user.name,
         email=user.email,
@@ -36,13 +69,45 @@ async def get_current_user_details(
         verified=user.verified,
         created_at=user.created_at.isoformat()
     )
+    
+    if fields:
+        return JSONResponse(
+            content=user_details.model_dump(mode="json", include=fields),
+            headers=cache_headers(etag)
+        )
+    
+    response.headers.update(cache_headers(etag))
+    return user_details
+
+
+@router.get("/me", response_model=UserDetailResponse)
+async def get_current_user_details(
+    request: Request,
+    response: Response,
+    current_user: TokenData = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[Set[str]] = Depends(sparse_fieldset(UserDetailResponse))
+):
+    """
+    Get current authenticated user's details
+    
+    Convenience endpoint to get the current user's own details.
+    Send the last received ETag in **If-None-Match** to get a 304 when unchanged.
+    Use **fields** (e.g. `?fields=id,name`) to return only some fields.
+    """
+    return _user_detail_response(current_user.user_id, request, response, current_user, db, if_none_match, fields)
 
 
 @router.get("/{user_id}", response_model=UserDetailResponse)
 async def get_user_details(
     user_id: str,
+    request: Request,
+    response: Response,
     current_user: TokenData = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[Set[str]] = Depends(sparse_fieldset(UserDetailResponse))
 ):
     """
     Get user details by user ID
@@ -51,28 +116,21 @@ async def get_user_details(
     
     Returns user details based on the authenticated user's permissions.
     Users can only view their own details.
+    Send the last received ETag in **If-None-Match** to get a 304 when unchanged.
+    Use **fields** (e.g. `?fields=id,name`) to return only some fields.
     """
     # Check if user is trying to access their own data
     if current_user.user_id != user_id:
+        AuditService.log_event(
+            AuditAction.USER_VIEWED,
+            actor_id=current_user.user_id,
+            subject_id=user_id,
+            ip_address=client_ip(request),
+            details={"denied": True}
+        )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only access your own user details"
         )
     
-    # Get user from database
-    user = UserService.get_user_by_id(db, user_id)
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    return UserDetailResponse(
-        id=str(user.id),
-        name=user.name,
-        email=user.email,
-        role=user.role,
-        verified=user.verified,
-        created_at=user.created_at.isoformat()
-    )
+    return _user_detail_response(user_id, request, response, current_user, db, if_none_match, fields)
@@ -7,5 +7,94 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
\ No newline at end of file
+# HS256 signs with SECRET_KEY. ES256/RS256 sign with PEM keys named <kid>.pem in
+# JWT_KEYS_DIR: JWT_ACTIVE_KID signs new tokens, every key in the directory
+# verifies, and public keys are served at /.well-known/jwks.json so other
+# services can verify tokens without the secret. (python-jose has no EdDSA.)
+ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", "keys")
+JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID")
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+
+# Audit Log Configuration
+# Events are queued in memory and flushed in batches when either limit is hit
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "2.0"))
+# Events beyond this many queued (e.g. during a database outage), and events
+# the database rejects, are appended as JSON lines to the dead letter file
+AUDIT_MAX_QUEUE_SIZE = int(os.getenv("AUDIT_MAX_QUEUE_SIZE", "100000"))
+AUDIT_DEAD_LETTER_PATH = os.getenv("AUDIT_DEAD_LETTER_PATH", "audit_dead_letter.jsonl")
+# Monthly partitions created ahead of time on startup
+AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", "2"))
+
+
+# HTTP Caching Configuration
+USER_CACHE_CONTROL = os.getenv("USER_CACHE_CONTROL", "private, no-cache")
+# How long a known user row version is trusted without re-reading the database.
+# Bounds how stale a 304 can be when another process updates the user.
+USER_VERSION_CACHE_TTL_SECONDS = float(os.getenv("USER_VERSION_CACHE_TTL_SECONDS", "30"))
+USER_VERSION_CACHE_MAX_SIZE = int(os.getenv("USER_VERSION_CACHE_MAX_SIZE", "10000"))
+
+
+# Response Compression Configuration
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Responses smaller than this (bytes) are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_CONTENT_TYPES = [
+    content_type.strip()
+    for content_type in os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "application/json,text/html,text/plain,text/css,application/javascript"
+    ).split(",")
+    if content_type.strip()
+]
+# Level 1 keeps compression at or below json.dumps cost on 10-100 KB responses
+# (gzip 0.4-1.0x, brotli 0.25-0.4x). gzip 5 / brotli 4 cost 0.8-2.2x / 1.1-1.5x
+# for a ratio only ~5% higher than gzip 1; brotli 1 already matches gzip 5.
+# Measured with scripts/bench_compression.py, re-run it before raising them.
+GZIP_COMPRESSION_LEVEL = int(os.getenv("GZIP_COMPRESSION_LEVEL", "1"))
+# Brotli is only used when the optional brotli package is installed
+BROTLI_ENABLED = os.getenv("BROTLI_ENABLED", "true").lower() == "true"
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "1"))
+
+
+# Password Hashing Configuration
+# New passwords use the first scheme; hashes in the other schemes, or with
+# a lower cost than configured, are rehashed on the next successful login.
+# Startup fails if a scheme has no backend installed. Pick costs for the deployment
+# hardware with scripts/calibrate_password_hash.py.
+PASSWORD_HASH_SCHEMES = [
+    scheme.strip()
+    for scheme in os.getenv("PASSWORD_HASH_SCHEMES", "bcrypt").split(",")
+    if scheme.strip()
+]
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "19456"))  # KiB
+
+
+# Idempotency-Key Configuration
+# Keys and their stored responses are deleted once they are older than the TTL
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS = int(os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS", "3600"))
+# Longer keys are rejected with 400
+IDEMPOTENCY_KEY_MAX_LENGTH = int(os.getenv("IDEMPOTENCY_KEY_MAX_LENGTH", "255"))
+# An in-progress key older than this is assumed abandoned and can be reused
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", "60"))
+
+
+# Background Job Configuration
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+# Retry delay doubles per attempt, with jitter, up to the max
+JOB_RETRY_BASE_DELAY_SECONDS = float(os.getenv("JOB_RETRY_BASE_DELAY_SECONDS", "10"))
+JOB_RETRY_MAX_DELAY_SECONDS = float(os.getenv("JOB_RETRY_MAX_DELAY_SECONDS", "3600"))
+# Running jobs whose lock was not refreshed for this long are assumed lost with
+# their worker; workers refresh the lock every JOB_HEARTBEAT_INTERVAL_SECONDS
+JOB_STALE_AFTER_SECONDS = float(os.getenv("JOB_STALE_AFTER_SECONDS", "600"))
+JOB_HEARTBEAT_INTERVAL_SECONDS = float(os.getenv("JOB_HEARTBEAT_INTERVAL_SECONDS", "30"))
+JOB_METRICS_INTERVAL_SECONDS = float(os.getenv("JOB_METRICS_INTERVAL_SECONDS", "60"))
+# Succeeded and failed jobs are deleted once they are older than this
+JOB_RETENTION_HOURS = int(os.getenv("JOB_RETENTION_HOURS", "168"))
+JOB_CLEANUP_INTERVAL_SECONDS = int(os.getenv("JOB_CLEANUP_INTERVAL_SECONDS", "3600"))
+STATS_CHECK_INTERVAL_SECONDS = int(os.getenv("STATS_CHECK_INTERVAL_SECONDS", "3600"))
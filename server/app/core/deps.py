@@ -1,14 +1,23 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from typing import Optional, Set, Type
 
 from app.data.db import get_db
 from app.services.auth_service import AuthService
 from app.services.user_service import UserService
 from app.data.schema import TokenData
+from app.jobs.queue import JobQueue
 
 # Security scheme for JWT
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+
+def get_job_queue(db: Session = Depends(get_db)) -> JobQueue:
+    """Job queue bound to the request's database session"""
+    return JobQueue(db)
 
 
 async def get_current_user(
@@ -19,6 +28,10 @@ async def get_current_user(
     token = credentials.credentials
     token_data = AuthService.verify_token(token)
     
+    # Recently seen users are known to exist, skip the database
+    if UserService.get_cached_version(token_data.user_id) is not None:
+        return token_data
+    
     # Verify user still exists in database
     user = UserService.get_user_by_id(db, token_data.user_id)
     if user is None:
@@ -28,9 +41,22 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    UserService.remember_user(user)
     return token_data
 
 
+async def get_optional_token_data(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Optional[TokenData]:
+    """Get token data if a valid JWT token was sent, without requiring one"""
+    if credentials is None:
+        return None
+    try:
+        return AuthService.verify_token(credentials.credentials)
+    except HTTPException:
+        return None
+
+
 async def get_current_active_user(
     current_user: TokenData = Depends(get_current_user)
 ) -> TokenData:
@@ -50,3 +76,23 @@ def require_role(required_role: str):
             )
         return current_user
     return role_checker
+
+
+def sparse_fieldset(model: Type[BaseModel]):
+    """Dependency factory for ?fields= sparse fieldsets on a response model"""
+    allowed_fields = set(model.model_fields)
+    
+    def fields_parser(
+        fields: Optional[str] = Query(None, description="Comma separated list of fields to return")
+    ) -> Optional[Set[str]]:
+        if not fields:
+            return None
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - allowed_fields
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        return requested or None
+    return fields_parser
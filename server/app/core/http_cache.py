@@ -0,0 +1,43 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+from app.core.config import USER_CACHE_CONTROL
+
+
+def user_etag(user_id, version: int, variant: str = "") -> str:
+    """
+    Build a weak ETag for a user representation from its row version
+
+    Weak because the same tag is sent for every content coding, so a
+    compressed 200 and the matching 304 carry the same validator.
+    """
+    digest = hashlib.sha256(f"{user_id}:{version}:{variant}".encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque_tag:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict:
+    """Caching headers sent with both full and 304 responses"""
+    return {"ETag": etag, "Cache-Control": USER_CACHE_CONTROL}
+
+
+def not_modified_response(etag: str) -> Response:
+    """Empty 304 response for a matching conditional request"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
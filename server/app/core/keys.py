@@ -0,0 +1,87 @@
+import os
+from typing import Dict, List, Optional
+
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.constants import ALGORITHMS
+from jose.exceptions import JWTError
+
+from app.core.config import SECRET_KEY, ALGORITHM, JWT_KEYS_DIR, JWT_ACTIVE_KID
+
+
+class KeyManager:
+    """
+    Holds JWT signing and verification keys as parsed key objects
+
+    Keys are loaded once at startup, so encoding and decoding tokens never
+    re-parses the secret or PEM key material.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: Optional[str] = None,
+        keys_dir: Optional[str] = None,
+        active_kid: Optional[str] = None
+    ):
+        self.algorithm = algorithm
+        self.active_kid: Optional[str] = None
+        self.verification_keys: Dict[Optional[str], Key] = {}
+        self._public_jwks: List[dict] = []
+
+        if algorithm in ALGORITHMS.HMAC:
+            self.signing_key = jwk.construct(secret_key, algorithm)
+            self.verification_keys[None] = self.signing_key
+        else:
+            self._load_key_files(keys_dir, active_kid)
+
+    def _load_key_files(self, keys_dir: str, active_kid: Optional[str]) -> None:
+        if not keys_dir or not os.path.isdir(keys_dir):
+            raise ValueError(f"JWT keys directory not found: {keys_dir}")
+
+        private_keys: Dict[str, Key] = {}
+        for filename in sorted(os.listdir(keys_dir)):
+            if not filename.endswith(".pem"):
+                continue
+            kid = filename[:-len(".pem")]
+            with open(os.path.join(keys_dir, filename)) as key_file:
+                key = jwk.construct(key_file.read(), self.algorithm)
+            public_key = key if key.is_public() else key.public_key()
+            if not key.is_public():
+                private_keys[kid] = key
+            self.verification_keys[kid] = public_key
+            self._public_jwks.append({**public_key.to_dict(), "kid": kid, "use": "sig", "alg": self.algorithm})
+
+        # Default to the newest private key when kids sort by date
+        if active_kid is None and private_keys:
+            active_kid = max(private_keys)
+        if active_kid not in private_keys:
+            raise ValueError(f"No private key for active JWT key id: {active_kid}")
+        self.active_kid = active_kid
+        self.signing_key = private_keys[active_kid]
+
+    def headers(self) -> dict:
+        """Extra JWT headers for newly signed tokens"""
+        return {"kid": self.active_kid} if self.active_kid else {}
+
+    def get_verification_key(self, token: str) -> Key:
+        """Pick the key that verifies a token, based on its kid header"""
+        if self.algorithm in ALGORITHMS.HMAC:
+            return self.signing_key
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.verification_keys.get(kid)
+        if key is None:
+            raise JWTError("Unknown key id")
+        return key
+
+    def jwks(self) -> dict:
+        """Public keys as a JSON Web Key Set; empty for shared-secret algorithms"""
+        return {"keys": self._public_jwks}
+
+
+key_manager = KeyManager(
+    algorithm=ALGORITHM,
+    secret_key=SECRET_KEY,
+    keys_dir=JWT_KEYS_DIR,
+    active_kid=JWT_ACTIVE_KID
+)
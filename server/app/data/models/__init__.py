@@ -1,3 +1,17 @@
 from .user_model import User, UserRole
+from .audit_model import AuditEvent, AuditAction
+from .idempotency_model import IdempotencyKey
+from .stats_model import UserStat, StatDimension
+from .job_model import Job, JobStatus
 
-__all__ = ["User", "UserRole"]
+__all__ = [
+    "User",
+    "UserRole",
+    "AuditEvent",
+    "AuditAction",
+    "IdempotencyKey",
+    "UserStat",
+    "StatDimension",
+    "Job",
+    "JobStatus"
+]
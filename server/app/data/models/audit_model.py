@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, Identity, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.data.db import Base
+
+
+class AuditAction:
+    """Audit event action names"""
+    REGISTER = "auth.register"
+    LOGIN = "auth.login"
+    LOGIN_FAILED = "auth.login_failed"
+    LOGOUT = "auth.logout"
+    USER_VIEWED = "users.viewed"
+
+
+class AuditEvent(Base):
+    """Append-only audit log, range-partitioned by month on occurred_at"""
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_actor_id_occurred_at", "actor_id", "occurred_at"),
+        Index("ix_audit_events_subject_id_occurred_at", "subject_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    # The partition key has to be part of the primary key
+    id = Column(BigInteger, Identity(), primary_key=True)
+    occurred_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    action = Column(String, nullable=False)
+    actor_id = Column(UUID(as_uuid=True), nullable=True)
+    subject_id = Column(UUID(as_uuid=True), nullable=True)
+    ip_address = Column(String, nullable=True)
+    details = Column(JSONB, nullable=True)
+
+    def __repr__(self):
+        return f"<AuditEvent(id={self.id}, action={self.action}, actor_id={self.actor_id})>"
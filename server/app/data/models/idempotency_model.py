@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Integer, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.data.db import Base
+
+
+class IdempotencyKey(Base):
+    """Stored responses for requests sent with an Idempotency-Key header"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+    key = Column(String, primary_key=True)
+    scope = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)
+    # Null while the first request with this key is still in progress
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSONB, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key}, scope={self.scope}, status_code={self.status_code})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+
+from app.data.db import Base
+
+
+class StatDimension:
+    """Dimension names of the precomputed user stats"""
+    USERS_BY_ROLE = "users_by_role"
+    VERIFIED_USERS_BY_ROLE = "verified_users_by_role"
+    REGISTRATIONS_PER_DAY = "registrations_per_day"
+
+
+class UserStat(Base):
+    """Precomputed user counts, kept up to date on writes by StatsService"""
+    __tablename__ = "user_stats"
+
+    dimension = Column(String, primary_key=True)
+    bucket = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<UserStat(dimension={self.dimension}, bucket={self.bucket}, count={self.count})>"
@@ -19,6 +19,11 @@ from .auth_schema import (
     LogoutResponse
 )
 
+from .stats_schema import (
+    DailyCountResponse,
+    StatsResponse
+)
+
 __all__ = [
     # User schemas
     "UserResponse",
@@ -37,5 +42,9 @@ __all__ = [
     "PasswordChangeRequest",
     "TokenResponse",
     "LoginResponse",
-    "LogoutResponse"
+    "LogoutResponse",
+    
+    # Stats schemas
+    "DailyCountResponse",
+    "StatsResponse"
 ]
\ No newline at end of file
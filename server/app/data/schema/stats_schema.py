@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+class DailyCountResponse(BaseModel):
+    """Count for a single UTC day"""
+    date: str
+    count: int
+
+
+class StatsResponse(BaseModel):
+    """Dashboard aggregates response schema"""
+    users_by_role: Dict[str, int]
+    verified_users_by_role: Dict[str, int]
+    registrations_per_day: List[DailyCountResponse]
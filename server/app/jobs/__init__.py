@@ -0,0 +1,5 @@
+# Background jobs package
+from app.jobs.registry import JobName, job, scheduled_job
+from app.jobs.queue import JobQueue, InMemoryJobQueue
+
+__all__ = ["JobName", "job", "scheduled_job", "JobQueue", "InMemoryJobQueue"]
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.data.models import Job, JobStatus
+from app.core.config import JOB_MAX_ATTEMPTS
+from app.jobs import registry
+
+
+class JobQueue:
+    """
+    Enqueues jobs into the jobs table
+
+    Jobs are inserted in the caller's session and become visible to
+    workers when the caller commits, so a job is never run for work that
+    was rolled back.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        name: str,
+        payload: Optional[dict] = None,
+        run_at: Optional[datetime] = None,
+        dedupe_key: Optional[str] = None
+    ) -> None:
+        """Add a job; with a dedupe_key, a job with the same key is only enqueued once"""
+        definition = registry.get_job(name)
+        if definition is None:
+            raise LookupError(f"No handler registered for job {name}")
+        values = {
+            "name": name,
+            "payload": payload or {},
+            "status": JobStatus.QUEUED,
+            "attempts": 0,
+            "max_attempts": definition.max_attempts or JOB_MAX_ATTEMPTS,
+            "dedupe_key": dedupe_key,
+        }
+        if run_at is not None:
+            values["run_at"] = run_at
+        stmt = insert(Job).values(**values)
+        if dedupe_key is not None:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Job.dedupe_key])
+        self.db.execute(stmt)
+
+    @staticmethod
+    def stats(db: Session) -> dict:
+        """Queued and running job counts and the age in seconds of the oldest runnable job"""
+        # Finished jobs are left out so the counts stay cheap as history accumulates
+        counts = dict(db.execute(
+            select(Job.status, func.count())
+            .where(Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+            .group_by(Job.status)
+        ).all())
+        lag = db.scalar(
+            select(func.extract("epoch", func.now() - func.min(Job.run_at)))
+            .where(Job.status == JobStatus.QUEUED, Job.run_at <= func.now())
+        )
+        return {"counts": counts, "oldest_queued_seconds": float(lag or 0)}
+
+    @staticmethod
+    def purge_finished(db: Session, older_than_hours: int) -> int:
+        """Delete succeeded and failed jobs that finished before the cutoff, returns the count"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=older_than_hours)
+        result = db.execute(
+            delete(Job)
+            .where(
+                Job.status.in_([JobStatus.SUCCEEDED, JobStatus.FAILED]),
+                Job.finished_at < cutoff
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+
+class InMemoryJobQueue:
+    """
+    Job queue that keeps jobs in a list, for unit tests
+
+    Override the get_job_queue dependency with it to assert on enqueued
+    jobs without a database or worker.
+    """
+
+    def __init__(self):
+        self.jobs: List[dict] = []
+
+    def enqueue(
+        self,
+        name: str,
+        payload: Optional[dict] = None,
+        run_at: Optional[datetime] = None,
+        dedupe_key: Optional[str] = None
+    ) -> None:
+        if registry.get_job(name) is None:
+            raise LookupError(f"No handler registered for job {name}")
+        if dedupe_key is not None and any(job["dedupe_key"] == dedupe_key for job in self.jobs):
+            return
+        self.jobs.append({"name": name, "payload": payload or {}, "run_at": run_at, "dedupe_key": dedupe_key})
+
+    def run_all(self, db: Session) -> None:
+        """Run the enqueued jobs in order with their registered handlers"""
+        while self.jobs:
+            job = self.jobs.pop(0)
+            definition = registry.get_job(job["name"])
+            if definition is None:
+                raise LookupError(f"No handler registered for job {job['name']}")
+            definition.handler(db, job["payload"])
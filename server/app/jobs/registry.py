@@ -0,0 +1,69 @@
+import importlib
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+class JobName:
+    """Names of the jobs registered in app.jobs.tasks"""
+    SEND_WELCOME_MESSAGE = "send_welcome_message"
+    CHECK_USER_STATS = "check_user_stats"
+    ENSURE_AUDIT_PARTITIONS = "ensure_audit_partitions"
+    PURGE_FINISHED_JOBS = "purge_finished_jobs"
+    PURGE_IDEMPOTENCY_KEYS = "purge_idempotency_keys"
+
+
+# A job handler gets its own database session and the job payload
+JobHandler = Callable[[Session, dict], None]
+
+
+class JobDefinition:
+    """A registered job handler and its retry policy"""
+
+    def __init__(self, name: str, handler: JobHandler, max_attempts: Optional[int]):
+        self.name = name
+        self.handler = handler
+        self.max_attempts = max_attempts
+
+
+class ScheduleDefinition:
+    """A job enqueued every `every_seconds` seconds"""
+
+    def __init__(self, name: str, every_seconds: int):
+        self.name = name
+        self.every_seconds = every_seconds
+
+
+jobs: Dict[str, JobDefinition] = {}
+schedules: Dict[str, ScheduleDefinition] = {}
+
+
+def job(name: str, max_attempts: Optional[int] = None):
+    """Decorator registering a job handler under a name"""
+    def register(handler: JobHandler) -> JobHandler:
+        if name in jobs:
+            raise ValueError(f"Job already registered: {name}")
+        jobs[name] = JobDefinition(name, handler, max_attempts)
+        return handler
+    return register
+
+
+def scheduled_job(name: str, every_seconds: int, max_attempts: Optional[int] = None):
+    """Decorator registering a job handler that workers enqueue on a fixed interval"""
+    def register(handler: JobHandler) -> JobHandler:
+        job(name, max_attempts)(handler)
+        schedules[name] = ScheduleDefinition(name, every_seconds)
+        return handler
+    return register
+
+
+def load_tasks() -> None:
+    """Import app.jobs.tasks so its handlers register; safe to call repeatedly"""
+    # Imported lazily: the tasks import services that themselves enqueue jobs
+    importlib.import_module("app.jobs.tasks")
+
+
+def get_job(name: str) -> Optional[JobDefinition]:
+    """Get a registered job by name"""
+    if name not in jobs:
+        load_tasks()
+    return jobs.get(name)
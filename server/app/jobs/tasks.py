@@ -0,0 +1,61 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.jobs.registry import JobName, job, scheduled_job
+from app.jobs.queue import JobQueue
+from app.services.audit_service import AuditService
+from app.services.idempotency_service import IdempotencyService
+from app.services.stats_service import StatsService
+from app.services.user_service import UserService
+from app.core.config import (
+    AUDIT_PARTITION_MONTHS_AHEAD,
+    STATS_CHECK_INTERVAL_SECONDS,
+    JOB_RETENTION_HOURS,
+    JOB_CLEANUP_INTERVAL_SECONDS,
+    IDEMPOTENCY_KEY_TTL_HOURS,
+    IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+@job(JobName.SEND_WELCOME_MESSAGE)
+def send_welcome_message(db: Session, payload: dict) -> None:
+    """Welcome a newly registered user (PRD 3.2)"""
+    user = UserService.get_user_by_id(db, payload["user_id"])
+    if user is None:
+        return
+    # No message provider is configured yet; delivery is logged without personal data
+    logger.info("Welcome message for user %s", user.id)
+
+
+@scheduled_job(JobName.CHECK_USER_STATS, every_seconds=STATS_CHECK_INTERVAL_SECONDS)
+def check_user_stats(db: Session, payload: dict) -> None:
+    """Rebuild the dashboard counters if they drifted from a full recompute"""
+    mismatches = StatsService.check_consistency(db)
+    if mismatches:
+        logger.warning("Rebuilding user stats, %d counters were off: %s", len(mismatches), mismatches[:10])
+        StatsService.rebuild(db)
+
+
+@scheduled_job(JobName.ENSURE_AUDIT_PARTITIONS, every_seconds=24 * 60 * 60)
+def ensure_audit_partitions(db: Session, payload: dict) -> None:
+    """Create upcoming monthly audit log partitions"""
+    AuditService.ensure_partitions(db, AUDIT_PARTITION_MONTHS_AHEAD)
+
+
+@scheduled_job(JobName.PURGE_FINISHED_JOBS, every_seconds=JOB_CLEANUP_INTERVAL_SECONDS)
+def purge_finished_jobs(db: Session, payload: dict) -> None:
+    """Delete old succeeded and failed jobs so the jobs table does not grow forever"""
+    deleted = JobQueue.purge_finished(db, JOB_RETENTION_HOURS)
+    if deleted:
+        logger.info("Purged %d finished jobs", deleted)
+
+
+@scheduled_job(JobName.PURGE_IDEMPOTENCY_KEYS, every_seconds=IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS)
+def purge_idempotency_keys(db: Session, payload: dict) -> None:
+    """Delete expired Idempotency-Keys and the registration responses stored with them"""
+    deleted = IdempotencyService.purge_expired(db, IDEMPOTENCY_KEY_TTL_HOURS)
+    if deleted:
+        logger.info("Purged %d expired idempotency keys", deleted)
@@ -0,0 +1,269 @@
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.data.db import SessionLocal
+from app.data.models import Job, JobStatus
+from app.jobs import registry
+from app.jobs.queue import JobQueue
+from app.core.config import (
+    JOB_POLL_INTERVAL_SECONDS,
+    JOB_RETRY_BASE_DELAY_SECONDS,
+    JOB_RETRY_MAX_DELAY_SECONDS,
+    JOB_STALE_AFTER_SECONDS,
+    JOB_HEARTBEAT_INTERVAL_SECONDS,
+    JOB_METRICS_INTERVAL_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for a job that failed `attempts` times"""
+    delay = min(JOB_RETRY_MAX_DELAY_SECONDS, JOB_RETRY_BASE_DELAY_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobMetrics:
+    """In-process counters for the jobs run by one worker"""
+
+    def __init__(self):
+        self.succeeded: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.retried: Dict[str, int] = {}
+        self.total_seconds: Dict[str, float] = {}
+        self.max_seconds: Dict[str, float] = {}
+
+    def record(self, name: str, outcome: Dict[str, int], seconds: float) -> None:
+        outcome[name] = outcome.get(name, 0) + 1
+        self.total_seconds[name] = self.total_seconds.get(name, 0.0) + seconds
+        self.max_seconds[name] = max(self.max_seconds.get(name, 0.0), seconds)
+
+    def snapshot(self) -> dict:
+        names = sorted(self.total_seconds)
+        return {
+            name: {
+                "succeeded": self.succeeded.get(name, 0),
+                "retried": self.retried.get(name, 0),
+                "failed": self.failed.get(name, 0),
+                "avg_seconds": self.total_seconds[name] / (
+                    self.succeeded.get(name, 0) + self.retried.get(name, 0) + self.failed.get(name, 0)
+                ),
+                "max_seconds": self.max_seconds[name],
+            }
+            for name in names
+        }
+
+
+class JobHeartbeat:
+    """Refreshes a running job's lock in the background so it is not taken for stale"""
+
+    def __init__(self, job_id: int, worker_id: str, interval: float = JOB_HEARTBEAT_INTERVAL_SECONDS):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-heartbeat-{job_id}", daemon=True)
+
+    def __enter__(self) -> "JobHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            db = SessionLocal()
+            try:
+                result = db.execute(
+                    update(Job)
+                    .where(Job.id == self.job_id, Job.locked_by == self.worker_id)
+                    .values(locked_at=func.now())
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+                if not result.rowcount:
+                    logger.warning("Job %s is no longer locked by %s", self.job_id, self.worker_id)
+                    return
+            except Exception:
+                logger.exception("Failed to refresh the lock of job %s", self.job_id)
+            finally:
+                db.close()
+
+
+class Worker:
+    """Polls the jobs table and runs due jobs one at a time; run more processes to scale"""
+
+    def __init__(self, worker_id: Optional[str] = None, poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.metrics = JobMetrics()
+        self.stop_event = threading.Event()
+        self._next_schedule_check: Dict[str, float] = {}
+        self._next_maintenance = 0.0
+
+    def run(self) -> None:
+        """Run until stop() is called"""
+        logger.info("Job worker %s started with jobs: %s", self.worker_id, ", ".join(sorted(registry.jobs)))
+        while not self.stop_event.is_set():
+            try:
+                self.run_maintenance()
+                if not self.run_next():
+                    self.stop_event.wait(self.poll_interval)
+            except Exception:
+                logger.exception("Job worker loop failed")
+                self.stop_event.wait(self.poll_interval)
+        logger.info("Job worker %s stopped: %s", self.worker_id, self.metrics.snapshot())
+
+    def stop(self) -> None:
+        """Finish the current job and stop"""
+        self.stop_event.set()
+
+    def run_maintenance(self) -> None:
+        """Enqueue due scheduled jobs, recover stale jobs and log metrics"""
+        now = time.time()
+        db = SessionLocal()
+        try:
+            self.enqueue_scheduled(db, now)
+            if now >= self._next_maintenance:
+                self._next_maintenance = now + JOB_METRICS_INTERVAL_SECONDS
+                self.requeue_stale(db)
+                logger.info("Job queue %s, worker %s", JobQueue.stats(db), self.metrics.snapshot())
+        finally:
+            db.close()
+
+    def enqueue_scheduled(self, db: Session, now: float) -> None:
+        """Enqueue each scheduled job once per interval, deduplicated across workers"""
+        queue = JobQueue(db)
+        for schedule in registry.schedules.values():
+            if now < self._next_schedule_check.get(schedule.name, 0.0):
+                continue
+            slot = int(now // schedule.every_seconds)
+            queue.enqueue(schedule.name, dedupe_key=f"schedule:{schedule.name}:{slot}")
+            self._next_schedule_check[schedule.name] = (slot + 1) * schedule.every_seconds
+        db.commit()
+
+    def requeue_stale(self, db: Session) -> None:
+        """Requeue running jobs whose worker disappeared, or fail them if out of attempts"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+        result = db.execute(
+            update(Job)
+            .where(Job.status == JobStatus.RUNNING, Job.locked_at < cutoff)
+            .values(
+                status=case(
+                    (Job.attempts >= Job.max_attempts, JobStatus.FAILED),
+                    else_=JobStatus.QUEUED
+                ),
+                finished_at=case(
+                    (Job.attempts >= Job.max_attempts, func.now()),
+                    else_=None
+                ),
+                last_error="Worker stopped before the job finished",
+                locked_by=None,
+                locked_at=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount:
+            logger.warning("Recovered %d stale jobs", result.rowcount)
+
+    def claim(self, db: Session) -> Optional[Job]:
+        """Lock the next due job; SKIP LOCKED lets workers claim jobs concurrently"""
+        job = db.scalars(
+            select(Job)
+            .where(Job.status == JobStatus.QUEUED, Job.run_at <= datetime.now(timezone.utc))
+            .order_by(Job.run_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if job is None:
+            db.rollback()
+            return None
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.locked_by = self.worker_id
+        job.locked_at = datetime.now(timezone.utc)
+        db.commit()
+        return job
+
+    def run_next(self) -> bool:
+        """Claim and run one job, returns False if none was due"""
+        db = SessionLocal()
+        try:
+            job = self.claim(db)
+            if job is None:
+                return False
+            self.execute(db, job)
+            return True
+        finally:
+            db.close()
+
+    def execute(self, db: Session, job: Job) -> None:
+        job_id, name, payload = job.id, job.name, job.payload
+        attempts, max_attempts = job.attempts, job.max_attempts
+        definition = registry.get_job(name)
+        started = time.perf_counter()
+        try:
+            if definition is None:
+                raise LookupError(f"No handler registered for job {name}")
+            # Handlers get their own session so their work commits independently of the job row
+            job_db = SessionLocal()
+            try:
+                with JobHeartbeat(job_id, self.worker_id):
+                    definition.handler(job_db, payload)
+            finally:
+                job_db.close()
+        except Exception:
+            elapsed = time.perf_counter() - started
+            last_error = traceback.format_exc()[-4000:]
+            if attempts < max_attempts:
+                run_at = datetime.now(timezone.utc) + timedelta(seconds=retry_delay(attempts))
+                self.finish(db, job_id, status=JobStatus.QUEUED, run_at=run_at, last_error=last_error)
+                self.metrics.record(name, self.metrics.retried, elapsed)
+                logger.warning("Job %s (%s) failed, attempt %d of %d", job_id, name, attempts, max_attempts)
+            else:
+                self.finish(db, job_id, status=JobStatus.FAILED, finished_at=func.now(), last_error=last_error)
+                self.metrics.record(name, self.metrics.failed, elapsed)
+                logger.error("Job %s (%s) failed permanently:\n%s", job_id, name, last_error)
+            return
+
+        self.finish(db, job_id, status=JobStatus.SUCCEEDED, finished_at=func.now())
+        self.metrics.record(name, self.metrics.succeeded, time.perf_counter() - started)
+
+    def finish(self, db: Session, job_id: int, **values) -> bool:
+        """Release a job with its outcome, only if this worker still holds its lock"""
+        result = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == self.worker_id)
+            .values(locked_by=None, locked_at=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if not result.rowcount:
+            logger.warning("Job %s was taken over by another worker, its outcome here is discarded", job_id)
+            return False
+        return True
+
+
+def run_worker() -> None:
+    """Worker process entry point, stops cleanly on SIGINT/SIGTERM"""
+    # Register the job handlers and schedules
+    registry.load_tasks()
+
+    worker = Worker()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.stop())
+    worker.run()
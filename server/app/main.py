@@ -1,15 +1,53 @@
-from fastapi import FastAPI, Depends
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from app.data.db import get_db
+from app.data.db import get_db, SessionLocal
 from app.api.v1 import api_router
+from app.services.audit_service import AuditService, audit_writer
+from app.core.compression import CompressionMiddleware
+from app.core.keys import key_manager
+from app.core.config import (
+    AUDIT_PARTITION_MONTHS_AHEAD,
+    COMPRESSION_ENABLED,
+    COMPRESSION_MINIMUM_SIZE,
+    COMPRESSION_CONTENT_TYPES,
+    GZIP_COMPRESSION_LEVEL,
+    BROTLI_ENABLED,
+    BROTLI_QUALITY
+)
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background writers on startup and drain them on shutdown"""
+    db = SessionLocal()
+    try:
+        AuditService.ensure_partitions(db, AUDIT_PARTITION_MONTHS_AHEAD)
+    except Exception:
+        # Events still land in the default partition
+        logger.exception("Could not create audit log partitions")
+    finally:
+        db.close()
+
+    audit_writer.start()
+    try:
+        yield
+    finally:
+        audit_writer.stop()
+
 
 app = FastAPI(
     title="NGO Platform API",
     description="API for NGO Platform - Phase 1: Authentication & User Management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -21,6 +59,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Add response compression middleware
+if COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MINIMUM_SIZE,
+        content_types=COMPRESSION_CONTENT_TYPES,
+        gzip_level=GZIP_COMPRESSION_LEVEL,
+        brotli_quality=BROTLI_QUALITY,
+        brotli_enabled=BROTLI_ENABLED
+    )
+
 # Include API routes
 app.include_router(api_router, prefix="/v1")
 
@@ -29,6 +78,12 @@ async def root():
     """Root endpoint"""
     return {"message": "NGO Platform API - Phase 1", "version": "1.0.0"}
 
+@app.get("/.well-known/jwks.json")
+async def jwks(response: Response):
+    """Public keys for verifying access tokens in other services"""
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return key_manager.jwks()
+
 @app.get("/test-db")
 def test_db_connection(db: Session = Depends(get_db)):
     """Test database connection"""
@@ -0,0 +1,297 @@
+import json
+import logging
+import threading
+import uuid
+from collections import deque
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.data.db import SessionLocal
+from app.data.models import AuditEvent
+from app.core.config import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL_SECONDS,
+    AUDIT_MAX_QUEUE_SIZE,
+    AUDIT_DEAD_LETTER_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogWriter:
+    """Buffers audit events in memory and writes them to the database in batches"""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue_size: int, dead_letter_path: str):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.dead_letter_path = dead_letter_path
+        self.dead_lettered = 0
+        self._queue = deque()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._dead_letter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def enqueue(self, event: dict) -> None:
+        """Queue an event; wakes the flusher early once a full batch is waiting"""
+        if len(self._queue) >= self.max_queue_size:
+            # Keep memory bounded while the database is unavailable
+            self._dead_letter([event], "queue full")
+            return
+        self._queue.append(event)
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background flusher thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher and write out everything still queued"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Write all queued events in batches, returns the number written"""
+        written = 0
+        with self._flush_lock:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self.batch_size:
+                    batch.append(self._queue.popleft())
+                try:
+                    self._write(batch)
+                except OperationalError:
+                    logger.exception("Failed to write %d audit events, will retry", len(batch))
+                    # Put the batch back in order so the next flush retries it
+                    self._queue.extendleft(reversed(batch))
+                    break
+                except Exception:
+                    # Retrying a batch the database rejects would block the queue,
+                    # write its events one by one to isolate the bad rows
+                    logger.exception("Failed to write %d audit events, writing them one by one", len(batch))
+                    written += self._write_individually(batch)
+                    continue
+                written += len(batch)
+        return written
+
+    def _write_individually(self, batch: List[dict]) -> int:
+        written = 0
+        for event in batch:
+            try:
+                self._write([event])
+                written += 1
+            except Exception as e:
+                self._dead_letter([event], repr(e))
+        return written
+
+    def _dead_letter(self, events: List[dict], reason: str) -> None:
+        """Append events that cannot be stored in the database to the dead letter file"""
+        with self._dead_letter_lock:
+            self.dead_lettered += len(events)
+            try:
+                with open(self.dead_letter_path, "a") as dead_letter_file:
+                    for event in events:
+                        dead_letter_file.write(json.dumps({**event, "reason": reason}, default=str) + "\n")
+            except OSError:
+                logger.exception("Could not write audit dead letter file, events: %s", events)
+        logger.error(
+            "Wrote %d audit events to %s (%s), %d in total",
+            len(events), self.dead_letter_path, reason, self.dead_lettered
+        )
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    @staticmethod
+    def _write(batch: List[dict]) -> None:
+        db = SessionLocal()
+        try:
+            # Executemany insert, sent as multi-row VALUES statements
+            db.execute(insert(AuditEvent), batch)
+            db.commit()
+        finally:
+            db.close()
+
+
+audit_writer = AuditLogWriter(
+    batch_size=AUDIT_BATCH_SIZE,
+    flush_interval=AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_queue_size=AUDIT_MAX_QUEUE_SIZE,
+    dead_letter_path=AUDIT_DEAD_LETTER_PATH
+)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _as_uuid(value) -> Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """Get the client address of a request, if known"""
+    return request.client.host if request.client else None
+
+
+class AuditService:
+    """Audit log service for recording and querying access events"""
+
+    @staticmethod
+    def log_event(
+        action: str,
+        actor_id: Optional[str] = None,
+        subject_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        details: Optional[dict] = None
+    ) -> None:
+        """Queue an audit event; it is written asynchronously by the audit writer"""
+        subject_uuid = _as_uuid(subject_id)
+        if subject_id is not None and subject_uuid is None:
+            # Keep malformed ids (e.g. from URL paths) without failing the batch insert
+            details = {**(details or {}), "subject": str(subject_id)}
+        audit_writer.enqueue({
+            "occurred_at": datetime.now(timezone.utc),
+            "action": action,
+            "actor_id": _as_uuid(actor_id),
+            "subject_id": subject_uuid,
+            "ip_address": ip_address,
+            "details": details,
+        })
+
+    @staticmethod
+    def get_events_by_actor(
+        db: Session,
+        actor_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[AuditEvent]:
+        """Get the most recent events performed by a user"""
+        query = select(AuditEvent).where(AuditEvent.actor_id == actor_id)
+        return AuditService._recent_events(db, query, since, until, limit)
+
+    @staticmethod
+    def get_events_by_subject(
+        db: Session,
+        subject_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[AuditEvent]:
+        """Get the most recent events that accessed a user's data"""
+        query = select(AuditEvent).where(AuditEvent.subject_id == subject_id)
+        return AuditService._recent_events(db, query, since, until, limit)
+
+    @staticmethod
+    def _recent_events(db: Session, query, since, until, limit: int) -> List[AuditEvent]:
+        # Time bounds let Postgres prune partitions outside the range
+        if since is not None:
+            query = query.where(AuditEvent.occurred_at >= since)
+        if until is not None:
+            query = query.where(AuditEvent.occurred_at < until)
+        query = query.order_by(AuditEvent.occurred_at.desc()).limit(limit)
+        return list(db.scalars(query))
+
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: int) -> List[date]:
+        """
+        Create monthly partitions up to months_ahead, plus any month that
+        already has rows in the default partition
+
+        Each month is created in its own savepoint so one failure does not
+        stop the others. Returns the months that could not be created.
+        """
+        # Web workers and the daily job run this concurrently; the lock is held
+        # until the commit below, so each month is checked and created by one of them
+        db.execute(text("SELECT pg_advisory_xact_lock(hashtext('audit_events_partitions'))"))
+        today = datetime.now(timezone.utc).date()
+        month = date(today.year, today.month, 1)
+        months = set()
+        for _ in range(months_ahead + 1):
+            months.add(month)
+            month = _next_month(month)
+        # Months written while their partition was missing, e.g. after downtime
+        months.update(
+            row_month.date() for row_month in db.scalars(text(
+                "SELECT DISTINCT date_trunc('month', occurred_at AT TIME ZONE 'UTC') "
+                "FROM audit_events_default"
+            ))
+        )
+
+        failed = []
+        for month in sorted(months):
+            try:
+                with db.begin_nested():
+                    AuditService._create_partition(db, month)
+            except Exception:
+                logger.exception("Could not create audit log partition for %s", f"{month:%Y-%m}")
+                failed.append(month)
+        db.commit()
+
+        if failed:
+            logger.error(
+                "Audit log partitions missing for %s, their events stay in audit_events_default",
+                ", ".join(f"{month:%Y-%m}" for month in failed)
+            )
+        return failed
+
+    @staticmethod
+    def _create_partition(db: Session, month: date) -> None:
+        name = f"audit_events_{month:%Y_%m}"
+        if db.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+            return
+
+        bounds = {
+            "start": datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+            "end": datetime.combine(_next_month(month), datetime.min.time(), tzinfo=timezone.utc),
+        }
+        in_default = db.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM audit_events_default "
+            "WHERE occurred_at >= :start AND occurred_at < :end)"
+        ), bounds)
+        create = text(
+            f"CREATE TABLE {name} PARTITION OF audit_events "
+            f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+        )
+        if not in_default:
+            db.execute(create)
+            return
+
+        # Postgres refuses to create a partition for rows the default partition
+        # holds, so detach it, create the month and move its rows over
+        logger.warning("Moving %s audit events out of the default partition", f"{month:%Y-%m}")
+        db.execute(text("ALTER TABLE audit_events DETACH PARTITION audit_events_default"))
+        db.execute(create)
+        db.execute(text(
+            "INSERT INTO audit_events SELECT * FROM audit_events_default "
+            "WHERE occurred_at >= :start AND occurred_at < :end"
+        ), bounds)
+        db.execute(text(
+            "DELETE FROM audit_events_default WHERE occurred_at >= :start AND occurred_at < :end"
+        ), bounds)
+        db.execute(text("ALTER TABLE audit_events ATTACH PARTITION audit_events_default DEFAULT"))
@@ -2,14 +2,47 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from passlib.exc import MissingBackendError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from app.data.schema import TokenData
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.keys import key_manager
+from app.core.config import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    PASSWORD_HASH_SCHEMES,
+    BCRYPT_ROUNDS,
+    ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST
+)
+
+
+def build_password_context() -> CryptContext:
+    """Build the password hashing context from the configured policy"""
+    settings = {}
+    if "bcrypt" in PASSWORD_HASH_SCHEMES:
+        # min_rounds makes hashes with a lower cost report needs_update
+        settings.update(bcrypt__rounds=BCRYPT_ROUNDS, bcrypt__min_rounds=BCRYPT_ROUNDS)
+    if "argon2" in PASSWORD_HASH_SCHEMES:
+        settings.update(
+            argon2__rounds=ARGON2_TIME_COST,
+            argon2__min_rounds=ARGON2_TIME_COST,
+            argon2__memory_cost=ARGON2_MEMORY_COST
+        )
+    context = CryptContext(schemes=PASSWORD_HASH_SCHEMES, deprecated="auto", **settings)
+    # Fail at startup rather than on the first registration or login
+    for scheme in context.schemes():
+        handler = context.handler(scheme)
+        if hasattr(handler, "get_backend"):
+            try:
+                handler.get_backend()
+            except MissingBackendError as e:
+                raise ValueError(f"No backend installed for password hash scheme: {scheme}") from e
+    return context
+
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = build_password_context()
 
 
 class AuthService:
@@ -20,6 +53,11 @@ class AuthService:
         """Verify a plain password against its hash"""
         return pwd_context.verify(plain_password, hashed_password)
     
+    @staticmethod
+    def password_needs_update(hashed_password: str) -> bool:
+        """Check if a hash uses a deprecated scheme or a lower cost than configured"""
+        return pwd_context.needs_update(hashed_password)
+    
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Generate password hash"""
@@ -35,7 +73,12 @@ class AuthService:
             expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(
+            to_encode,
+            key_manager.signing_key,
+            algorithm=key_manager.algorithm,
+            headers=key_manager.headers()
+        )
         return encoded_jwt
     
     @staticmethod
@@ -48,7 +91,11 @@ class AuthService:
         )
         
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = jwt.decode(
+                token,
+                key_manager.get_verification_key(token),
+                algorithms=[key_manager.algorithm]
+            )
             user_id: str = payload.get("sub")
             email: str = payload.get("email")
             role: str = payload.get("role")
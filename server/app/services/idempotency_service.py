@@ -0,0 +1,133 @@
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.data.models import IdempotencyKey
+from app.core.config import (
+    SECRET_KEY,
+    IDEMPOTENCY_KEY_TTL_HOURS,
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+)
+
+
+class IdempotencyService:
+    """Idempotency-Key handling so retried requests replay the first response"""
+
+    @staticmethod
+    def request_hash(payload: dict) -> str:
+        """Fingerprint a request body; keyed so stored hashes reveal nothing about passwords"""
+        body = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+        return hmac.new(SECRET_KEY.encode(), body, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def begin(db: Session, key: str, scope: str, request_hash: str) -> Optional[IdempotencyKey]:
+        """
+        Claim a key for the current request
+
+        Returns None if the key was claimed and the request should proceed,
+        otherwise the record stored by an earlier request with the same key.
+        """
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be at most {IDEMPOTENCY_KEY_MAX_LENGTH} characters"
+            )
+        now = datetime.now(timezone.utc)
+        # Expired keys and abandoned in-progress claims can be reused
+        db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.scope == scope,
+                or_(
+                    IdempotencyKey.created_at < now - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS),
+                    and_(
+                        IdempotencyKey.status_code.is_(None),
+                        IdempotencyKey.created_at < now - timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+                    )
+                )
+            )
+        )
+        claimed = db.execute(
+            insert(IdempotencyKey)
+            .values(key=key, scope=scope, request_hash=request_hash)
+            .on_conflict_do_nothing(index_elements=["key", "scope"])
+            .returning(IdempotencyKey.key)
+        ).scalar_one_or_none()
+        # Commit right away so concurrent retries see the claim
+        db.commit()
+
+        if claimed is not None:
+            return None
+
+        existing = db.get(IdempotencyKey, (key, scope))
+        if existing is None:
+            # Released between our insert and read, treat as in progress
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is already in progress"
+            )
+        return existing
+
+    @staticmethod
+    def replay(record: IdempotencyKey, request_hash: str) -> JSONResponse:
+        """Return the stored response for a repeated request"""
+        if not hmac.compare_digest(record.request_hash, request_hash):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        if record.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is already in progress"
+            )
+        return JSONResponse(
+            content=record.response_body,
+            status_code=record.status_code,
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    @staticmethod
+    def complete(db: Session, key: str, scope: str, status_code: int, response_body: dict) -> None:
+        """Store the response for a claimed key"""
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.scope == scope)
+            .values(status_code=status_code, response_body=response_body)
+        )
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, key: str, scope: str) -> None:
+        """Drop a claim after a server error so the client can retry"""
+        db.rollback()
+        db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.status_code.is_(None)
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def purge_expired(db: Session, older_than_hours: int = IDEMPOTENCY_KEY_TTL_HOURS) -> int:
+        """Delete keys created before the cutoff along with their stored responses, returns the count"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=older_than_hours)
+        # Range delete on ix_idempotency_keys_created_at
+        result = db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.created_at < cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
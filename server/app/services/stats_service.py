@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.data.models import User, UserStat, StatDimension
+
+StatKey = Tuple[str, str]
+
+
+def _registration_day(created_at: datetime) -> str:
+    return created_at.astimezone(timezone.utc).date().isoformat()
+
+
+def _role_value(role) -> str:
+    return role.value if hasattr(role, "value") else str(role)
+
+
+class StatsService:
+    """Dashboard aggregates served from the incrementally maintained user_stats table"""
+
+    @staticmethod
+    def record_user_created(db: Session, user: User) -> None:
+        """
+        Increment the counters for a new user, in the caller's transaction
+
+        Rows are upserted in a fixed order so concurrent registrations
+        cannot deadlock on the counter rows.
+        """
+        role = _role_value(user.role)
+        increments = [
+            (StatDimension.USERS_BY_ROLE, role),
+            (StatDimension.REGISTRATIONS_PER_DAY, _registration_day(user.created_at)),
+        ]
+        if user.verified:
+            increments.append((StatDimension.VERIFIED_USERS_BY_ROLE, role))
+
+        stmt = pg_insert(UserStat).values([
+            {"dimension": dimension, "bucket": bucket, "count": 1}
+            for dimension, bucket in sorted(increments)
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[UserStat.dimension, UserStat.bucket],
+            set_={"count": UserStat.count + stmt.excluded.count, "updated_at": func.now()}
+        ))
+
+    @staticmethod
+    def get_summary(db: Session, days: int) -> dict:
+        """Get the dashboard aggregates, with registrations for the last `days` days"""
+        today = datetime.now(timezone.utc).date()
+        first_day = (today - timedelta(days=days - 1)).isoformat()
+
+        rows = db.execute(
+            select(UserStat.dimension, UserStat.bucket, UserStat.count).where(
+                (UserStat.dimension != StatDimension.REGISTRATIONS_PER_DAY)
+                | (UserStat.bucket >= first_day)
+            )
+        ).all()
+
+        summary = {
+            StatDimension.USERS_BY_ROLE: {},
+            StatDimension.VERIFIED_USERS_BY_ROLE: {},
+            StatDimension.REGISTRATIONS_PER_DAY: {},
+        }
+        for dimension, bucket, count in rows:
+            summary.setdefault(dimension, {})[bucket] = count
+
+        registrations = summary[StatDimension.REGISTRATIONS_PER_DAY]
+        summary[StatDimension.REGISTRATIONS_PER_DAY] = [
+            {"date": day, "count": registrations.get(day, 0)}
+            for day in (
+                (today - timedelta(days=offset)).isoformat()
+                for offset in range(days - 1, -1, -1)
+            )
+        ]
+        return summary
+
+    @staticmethod
+    def recompute(db: Session) -> Dict[StatKey, int]:
+        """Compute every aggregate from scratch with GROUP BY over users"""
+        counts: Dict[StatKey, int] = {}
+
+        for role, count in db.execute(select(User.role, func.count()).group_by(User.role)):
+            counts[(StatDimension.USERS_BY_ROLE, _role_value(role))] = count
+
+        verified = select(User.role, func.count()).where(User.verified.is_(True)).group_by(User.role)
+        for role, count in db.execute(verified):
+            counts[(StatDimension.VERIFIED_USERS_BY_ROLE, _role_value(role))] = count
+
+        day = func.to_char(func.timezone("UTC", User.created_at), "YYYY-MM-DD")
+        per_day = select(day, func.count()).where(User.created_at.isnot(None)).group_by(day)
+        for bucket, count in db.execute(per_day):
+            counts[(StatDimension.REGISTRATIONS_PER_DAY, bucket)] = count
+
+        return counts
+
+    @staticmethod
+    def check_consistency(db: Session) -> List[dict]:
+        """Compare the stored aggregates with a full recompute, returns the mismatches"""
+        stored = {
+            (dimension, bucket): count
+            for dimension, bucket, count in db.execute(
+                select(UserStat.dimension, UserStat.bucket, UserStat.count)
+            )
+        }
+        expected = StatsService.recompute(db)
+
+        mismatches = []
+        for key in sorted(stored.keys() | expected.keys()):
+            stored_count = stored.get(key, 0)
+            expected_count = expected.get(key, 0)
+            if stored_count != expected_count:
+                mismatches.append({
+                    "dimension": key[0],
+                    "bucket": key[1],
+                    "stored": stored_count,
+                    "expected": expected_count
+                })
+        return mismatches
+
+    @staticmethod
+    def rebuild(db: Session) -> None:
+        """Replace the stored aggregates with a full recompute"""
+        # Waits for in-flight registrations and blocks new increments until commit,
+        # so the recompute sees exactly the users the counters would have
+        db.execute(text("LOCK TABLE user_stats IN EXCLUSIVE MODE"))
+        counts = StatsService.recompute(db)
+        db.execute(delete(UserStat))
+        if counts:
+            db.execute(insert(UserStat), [
+                {"dimension": dimension, "bucket": bucket, "count": count}
+                for (dimension, bucket), count in counts.items()
+            ])
+        db.commit()
@@ -1,9 +1,28 @@
+import logging
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from fastapi import HTTPException, status
-from typing import Optional
+from typing import Optional, Union
 
-from app.data.models import User
+from app.data.db import SessionLocal
+from app.data.models import User, UserRole
 from app.services.auth_service import AuthService
+from app.services.stats_service import StatsService
+from app.jobs.registry import JobName
+from app.jobs.queue import JobQueue, InMemoryJobQueue
+from app.core.cache import TTLCache
+from app.core.config import USER_VERSION_CACHE_TTL_SECONDS, USER_VERSION_CACHE_MAX_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Last seen row version per user id, used to answer conditional requests
+# and token checks without a database round trip
+user_version_cache = TTLCache(
+    ttl_seconds=USER_VERSION_CACHE_TTL_SECONDS,
+    max_size=USER_VERSION_CACHE_MAX_SIZE
+)
 
 
 class UserService:
@@ -14,34 +33,96 @@ class UserService:
         """Get user by ID"""
         return db.query(User).filter(User.id == user_id).first()
     
+    @staticmethod
+    def get_cached_version(user_id: str) -> Optional[int]:
+        """Get the cached row version of a user, if known"""
+        return user_version_cache.get(str(user_id))
+    
+    @staticmethod
+    def remember_user(user: User) -> None:
+        """Cache the row version of a user that was just read or written"""
+        user_version_cache.set(str(user.id), user.version)
+    
+    @staticmethod
+    def forget_user(user_id: str) -> None:
+        """Drop a user from the version cache after it changed"""
+        user_version_cache.delete(str(user_id))
+    
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> Optional[User]:
         """Get user by email"""
         return db.query(User).filter(User.email == email).first()
     
     @staticmethod
-    def create_user(db: Session, name: str, email: str, password: str, role: str) -> User:
-        """Create a new user"""
-        # Check if user already exists
-        existing_user = UserService.get_user_by_email(db, email)
-        if existing_user:
+    def create_user(
+        db: Session,
+        name: str,
+        email: str,
+        password: str,
+        role: str,
+        job_queue: Optional[Union[JobQueue, InMemoryJobQueue]] = None
+    ) -> User:
+        """
+        Create a new user
+        
+        A single INSERT ... ON CONFLICT DO NOTHING RETURNING statement, so
+        concurrent registrations with the same email cannot both succeed
+        and the loser gets a 400 instead of a unique-violation error.
+        Follow-up work is enqueued on job_queue in the same transaction.
+        """
+        # Hash password
+        password_hash = AuthService.get_password_hash(password)
+        
+        # Create user
+        user = db.scalars(
+            insert(User)
+            .values(
+                name=name,
+                email=email,
+                password_hash=password_hash,
+                role=UserRole(role)
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
+        ).first()
+        
+        if user is None:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
-        # Hash password
-        password_hash = AuthService.get_password_hash(password)
+        # Dashboard counters are updated in the same transaction
+        StatsService.record_user_created(db, user)
         
-        # Create user
-        user = User(
-            name=name,
-            email=email,
-            password_hash=password_hash,
-            role=role
-        )
+        if job_queue is not None:
+            job_queue.enqueue(JobName.SEND_WELCOME_MESSAGE, {"user_id": str(user.id)})
         
-        db.add(user)
+        # RETURNING loaded every column; keep them from expiring on commit
+        db.expunge(user)
         db.commit()
-        db.refresh(user)
         return user
+    
+    @staticmethod
+    def upgrade_password_hash(user_id: str, old_hash: str, password: str) -> None:
+        """
+        Rehash a verified password with the current policy, run as a background task after login
+        
+        Only applies if the stored hash is still the one that was verified,
+        so a concurrent password change is never overwritten.
+        """
+        db = SessionLocal()
+        try:
+            new_hash = AuthService.get_password_hash(password)
+            db.execute(
+                update(User)
+                .where(User.id == user_id, User.password_hash == old_hash)
+                .values(password_hash=new_hash, version=User.version + 1, updated_at=func.now())
+            )
+            db.commit()
+            UserService.forget_user(user_id)
+        except Exception:
+            logger.exception("Failed to upgrade password hash for user %s", user_id)
+        finally:
+            db.close()
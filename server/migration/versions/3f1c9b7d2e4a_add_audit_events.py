@@ -0,0 +1,46 @@
+"""add audit_events
+
+Revision ID: 3f1c9b7d2e4a
+Revises: a56cd834e615
+Create Date: 2026-10-19 10:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9b7d2e4a'
+down_revision: Union[str, Sequence[str], None] = 'a56cd834e615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('audit_events',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('actor_id', sa.UUID(), nullable=True),
+    sa.Column('subject_id', sa.UUID(), nullable=True),
+    sa.Column('ip_address', sa.String(), nullable=True),
+    sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'occurred_at'),
+    postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index('ix_audit_events_actor_id_occurred_at', 'audit_events', ['actor_id', 'occurred_at'], unique=False)
+    op.create_index('ix_audit_events_subject_id_occurred_at', 'audit_events', ['subject_id', 'occurred_at'], unique=False)
+    # Catches rows for months whose partition has not been created yet;
+    # monthly partitions are created ahead of time by AuditService.ensure_partitions
+    op.execute('CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_events_subject_id_occurred_at', table_name='audit_events')
+    op.drop_index('ix_audit_events_actor_id_occurred_at', table_name='audit_events')
+    op.drop_table('audit_events')
@@ -0,0 +1,45 @@
+"""add user_stats
+
+Revision ID: e5a90c3b7d18
+Revises: c7d41e9a5f20
+Create Date: 2026-10-19 15:21:52.730945
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a90c3b7d18'
+down_revision: Union[str, Sequence[str], None] = 'c7d41e9a5f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_stats',
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'bucket')
+    )
+    # Backfill from existing users; roles are stored by enum name
+    op.execute("""
+        INSERT INTO user_stats (dimension, bucket, count)
+        SELECT 'users_by_role', lower(role::text), count(*) FROM users GROUP BY role
+        UNION ALL
+        SELECT 'verified_users_by_role', lower(role::text), count(*) FROM users WHERE verified GROUP BY role
+        UNION ALL
+        SELECT 'registrations_per_day', to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD'), count(*)
+        FROM users WHERE created_at IS NOT NULL
+        GROUP BY to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
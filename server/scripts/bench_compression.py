@@ -0,0 +1,135 @@
+"""
+Benchmark response compression cost against serialization cost.
+
+Run from the server directory:
+
+    python scripts/bench_compression.py [--iterations 2000]
+
+Prints per-codec compression ratio and time for user-list payloads of
+different sizes, then in-process requests/second through the ASGI app
+with and without CompressionMiddleware.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+# Add the parent directory to sys.path to import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the app package builds the (lazy) engine; no connection is made
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/unused")
+
+from starlette.responses import JSONResponse
+
+from app.core.compression import CompressionMiddleware, GzipCompressor, BrotliCompressor, brotli
+from app.core.config import (
+    COMPRESSION_MINIMUM_SIZE,
+    COMPRESSION_CONTENT_TYPES,
+    GZIP_COMPRESSION_LEVEL,
+    BROTLI_QUALITY
+)
+
+
+def make_payload(count: int) -> list:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Student Number {i}",
+            "email": f"student{i}@example.org",
+            "role": "student",
+            "verified": i % 3 == 0,
+            "created_at": "2026-10-19T10:12:41.518203+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def timed(func, iterations: int) -> float:
+    """Average seconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_codecs(iterations: int) -> None:
+    codecs = [("gzip", level, lambda level=level: GzipCompressor(level)) for level in (1, 5, 6, 9)]
+    if brotli is not None:
+        codecs += [("br", quality, lambda quality=quality: BrotliCompressor(quality)) for quality in (1, 4, 6, 11)]
+    else:
+        print("brotli is not installed, skipping br\n")
+
+    for count in (1, 50, 500):
+        payload = make_payload(count)
+        body = json.dumps(payload).encode()
+        serialize = timed(lambda: json.dumps(payload).encode(), iterations)
+        print(f"{count} users, {len(body)} bytes, json.dumps {serialize * 1e6:.1f} us")
+        print(f"  {'codec':<6}{'level':>6}{'ratio':>8}{'us/op':>10}{'MB/s':>9}{'x serialize':>13}")
+        for name, level, factory in codecs:
+            def compress():
+                compressor = factory()
+                return compressor.compress(body) + compressor.flush()
+            size = len(compress())
+            seconds = timed(compress, iterations)
+            print(
+                f"  {name:<6}{level:>6}{len(body) / size:>8.2f}{seconds * 1e6:>10.1f}"
+                f"{len(body) / seconds / 1e6:>9.1f}{seconds / serialize:>13.2f}"
+            )
+        print()
+
+
+async def bench_middleware(iterations: int) -> None:
+    payload = make_payload(50)
+
+    async def endpoint(scope, receive, send):
+        await JSONResponse(payload)(scope, receive, send)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", b"br, gzip")],
+    }
+
+    variants = [("uncompressed", endpoint)]
+    for encoding_name, brotli_enabled in (("gzip", False), ("br", True)):
+        if encoding_name == "br" and brotli is None:
+            continue
+        variants.append((encoding_name, CompressionMiddleware(
+            endpoint,
+            minimum_size=COMPRESSION_MINIMUM_SIZE,
+            content_types=COMPRESSION_CONTENT_TYPES,
+            gzip_level=GZIP_COMPRESSION_LEVEL,
+            brotli_quality=BROTLI_QUALITY,
+            brotli_enabled=brotli_enabled
+        )))
+
+    print(f"ASGI app, 50 users per response (gzip level {GZIP_COMPRESSION_LEVEL}, brotli quality {BROTLI_QUALITY})")
+    for name, app in variants:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await app(scope, receive, send)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<14}{iterations / elapsed:>10.0f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    bench_codecs(args.iterations)
+    asyncio.run(bench_middleware(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark access token encode/decode cost.
+
+    python scripts/bench_tokens.py [--iterations 2000]
+
+Compares passing the raw secret or PEM key to python-jose on every call,
+as AuthService did before the KeyManager, with passing key objects that
+were parsed once.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk, jwt
+
+CLAIMS = {
+    "sub": "6f1c2b1e-8d8a-4f61-9a53-3c1f0f1d2a77",
+    "email": "student@example.org",
+    "role": "student",
+    "exp": datetime.now(timezone.utc) + timedelta(hours=1),
+}
+
+
+def pem_pair(private_key):
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+def timed_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    secret = "your-secret-key-here-change-in-production"
+    cases = [
+        ("HS256", secret, secret),
+        ("ES256", *pem_pair(ec.generate_private_key(ec.SECP256R1()))),
+        ("RS256", *pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048))),
+    ]
+
+    print(f"{'algorithm':<10}{'keys':<10}{'encode us':>12}{'decode us':>12}")
+    for algorithm, signing_material, verifying_material in cases:
+        signing_key = jwk.construct(signing_material, algorithm)
+        verifying_key = jwk.construct(verifying_material, algorithm)
+        token = jwt.encode(CLAIMS, signing_key, algorithm=algorithm)
+
+        variants = [
+            ("raw", signing_material, verifying_material),
+            ("parsed", signing_key, verifying_key),
+        ]
+        for label, sign_with, verify_with in variants:
+            encode = timed_us(lambda: jwt.encode(CLAIMS, sign_with, algorithm=algorithm), args.iterations)
+            decode = timed_us(lambda: jwt.decode(token, verify_with, algorithms=[algorithm]), args.iterations)
+            print(f"{algorithm:<10}{label:<10}{encode:>12.1f}{decode:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Pick password hashing costs that hit a target verify time on this machine.
+
+Run from the server directory on the deployment hardware:
+
+    python scripts/calibrate_password_hash.py --scheme bcrypt --target-ms 250
+    python scripts/calibrate_password_hash.py --scheme argon2 --target-ms 100
+
+Prints the environment settings to use with app/core/config.py.
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import argon2, bcrypt
+
+SAMPLE_PASSWORD = "Calibrate-Password-123"
+
+
+def median_verify_ms(handler, samples: int) -> float:
+    hashed = handler.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.verify(SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_bcrypt(target_ms: float, samples: int) -> None:
+    best = None
+    for rounds in range(bcrypt.min_rounds, bcrypt.max_rounds + 1):
+        elapsed = median_verify_ms(bcrypt.using(rounds=rounds), samples)
+        print(f"bcrypt rounds={rounds:<3} {elapsed:8.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = rounds
+        # Each extra round doubles the cost, stop before timing one that is too slow
+        if elapsed * 2 > target_ms:
+            break
+
+    if best is None:
+        print(f"\nNo bcrypt cost verifies under {target_ms} ms on this machine")
+        return
+    print("\nPASSWORD_HASH_SCHEMES=bcrypt")
+    print(f"BCRYPT_ROUNDS={best}")
+
+
+def calibrate_argon2(target_ms: float, memory_kib: int, samples: int) -> None:
+    # Keep memory fixed and raise time cost; halve memory if even t=1 is too slow
+    while memory_kib >= 8 * 1024:
+        best = None
+        for time_cost in range(1, 11):
+            handler = argon2.using(rounds=time_cost, memory_cost=memory_kib)
+            elapsed = median_verify_ms(handler, samples)
+            print(f"argon2 m={memory_kib:<7} t={time_cost:<3} {elapsed:8.1f} ms")
+            if elapsed > target_ms:
+                break
+            best = time_cost
+        if best is not None:
+            print("\nPASSWORD_HASH_SCHEMES=argon2,bcrypt")
+            print(f"ARGON2_TIME_COST={best}")
+            print(f"ARGON2_MEMORY_COST={memory_kib}")
+            return
+        memory_kib //= 2
+    print(f"\nNo argon2 cost verifies under {target_ms} ms on this machine")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Target verify time in milliseconds")
+    parser.add_argument("--memory-kib", type=int, default=65536, help="Starting argon2 memory cost")
+    parser.add_argument("--samples", type=int, default=5, help="Verifications timed per setting")
+    args = parser.parse_args()
+
+    if args.scheme == "bcrypt":
+        calibrate_bcrypt(args.target_ms, args.samples)
+    else:
+        calibrate_argon2(args.target_ms, args.memory_kib, args.samples)
+
+
+if __name__ == "__main__":
+    main()
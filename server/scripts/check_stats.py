@@ -0,0 +1,46 @@
+"""
+Check the precomputed user stats against a full recompute.
+
+    python scripts/check_stats.py [--repair]
+
+Exits with status 1 if any counter is off. --repair rebuilds the
+user_stats table from the users table.
+"""
+import argparse
+import os
+import sys
+
+# Add the parent directory to sys.path to import our app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.data.db import SessionLocal
+from app.services.stats_service import StatsService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repair", action="store_true", help="Rebuild the stats from scratch")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        mismatches = StatsService.check_consistency(db)
+        for mismatch in mismatches:
+            print(
+                f"{mismatch['dimension']}/{mismatch['bucket']}: "
+                f"stored {mismatch['stored']}, expected {mismatch['expected']}"
+            )
+        if not mismatches:
+            print("Stats are consistent")
+            return
+        if args.repair:
+            StatsService.rebuild(db)
+            print(f"Rebuilt stats, fixed {len(mismatches)} counters")
+            return
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
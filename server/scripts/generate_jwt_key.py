@@ -0,0 +1,50 @@
+"""
+Generate a private key for signing access tokens.
+
+    python scripts/generate_jwt_key.py --algorithm ES256 --kid 2026-10
+
+Writes <keys-dir>/<kid>.pem. To rotate, generate a new key, set
+JWT_ACTIVE_KID to it and keep the old file until tokens signed with it
+have expired.
+"""
+import argparse
+import os
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+
+def generate_private_key(algorithm: str):
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--algorithm", choices=["ES256", "RS256"], default="ES256")
+    parser.add_argument("--kid", required=True, help="Key id, e.g. the month it was created")
+    parser.add_argument("--keys-dir", default=os.getenv("JWT_KEYS_DIR", "keys"))
+    args = parser.parse_args()
+
+    path = os.path.join(args.keys_dir, f"{args.kid}.pem")
+    if os.path.exists(path):
+        parser.error(f"{path} already exists")
+
+    pem = generate_private_key(args.algorithm).private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    os.makedirs(args.keys_dir, exist_ok=True)
+    # Private key, readable by the owner only
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as key_file:
+        key_file.write(pem)
+    print(f"Wrote {path}")
+    print(f"JWT_ALGORITHM={args.algorithm}")
+    print(f"JWT_ACTIVE_KID={args.kid}")
+
+
+if __name__ == "__main__":
+    main()
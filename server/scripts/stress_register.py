@@ -0,0 +1,75 @@
+"""
+Concurrency stress test for POST /v1/auth/register against a running server.
+
+    python scripts/stress_register.py --base-url http://localhost:8000 --concurrency 20
+
+Sends the same registration from many threads at once, first without and
+then with an Idempotency-Key, and checks that exactly one user is created,
+nothing fails with a 500, and idempotent retries all get the same response.
+"""
+import argparse
+import sys
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import httpx
+
+
+def registration(email: str) -> dict:
+    return {"name": "Stress Test", "email": email, "password": "Stress-Test-123", "role": "student"}
+
+
+def fire(base_url: str, concurrency: int, payload: dict, headers: dict) -> list:
+    # Release all threads at once to maximise overlap
+    barrier = Barrier(concurrency)
+
+    def send(_):
+        with httpx.Client(base_url=base_url, timeout=30) as client:
+            barrier.wait()
+            return client.post("/v1/auth/register", json=payload, headers=headers)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(send, range(concurrency)))
+
+
+def check_duplicate_emails(base_url: str, concurrency: int) -> bool:
+    responses = fire(base_url, concurrency, registration(f"stress-{uuid.uuid4().hex}@example.org"), {})
+    statuses = Counter(response.status_code for response in responses)
+    print(f"duplicate emails:      {dict(statuses)}")
+    return statuses[201] == 1 and statuses[400] == concurrency - 1
+
+
+def check_idempotent_retries(base_url: str, concurrency: int) -> bool:
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    payload = registration(f"stress-{uuid.uuid4().hex}@example.org")
+    responses = fire(base_url, concurrency, payload, headers)
+    # Retries racing the first request get 409 until it completes; retry them once it has
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        responses += [client.post("/v1/auth/register", json=payload, headers=headers) for _ in range(3)]
+
+    statuses = Counter(response.status_code for response in responses)
+    user_ids = {response.json()["id"] for response in responses if response.status_code == 201}
+    print(f"idempotent retries:    {dict(statuses)}, distinct user ids: {len(user_ids)}")
+    return set(statuses) <= {201, 409} and len(user_ids) == 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    ok = True
+    for _ in range(args.rounds):
+        ok &= check_duplicate_emails(args.base_url, args.concurrency)
+        ok &= check_idempotent_retries(args.base_url, args.concurrency)
+
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
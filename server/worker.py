@@ -0,0 +1,7 @@
+import logging
+
+from app.jobs.worker import run_worker
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    run_worker()